@@ -4,7 +4,8 @@ Simple usage example for Large-Set-Arboricity algorithms
 """
 
 import networkx as nx
-from large_set_arboricity import LargeSetArboricity, demonstrate_algorithm
+from large_set_arboricity_updated import LargeSetArboricity
+from test_large_set_arboricity import demonstrate_algorithm
 
 print("="*70)
 print("LARGE-SET-ARBORICITY: Quick Start Examples")
@@ -60,9 +61,9 @@ print(f"Approximation ratio: {alpha_k / dk_G:.2f}")
 print("\n\nExample 4: Petersen Graph with varying k")
 print("-" * 50)
 G = nx.petersen_graph()
+lsa = LargeSetArboricity(G)
 
 for k in [0, 3, 7]:
-    lsa = LargeSetArboricity(G)
     dk_G, _ = lsa.modified_degeneracy_algorithm(k)
     
     if k <= 7:  # Only compute exact for reasonable k
@@ -83,4 +84,4 @@ print("\n" + "="*70)
 print("Examples complete!")
 print("="*70)
 print("\nFor more examples, run: python test_large_set_arboricity.py")
-print("For full tests, run: python large_set_arboricity.py")
+print("For full tests, run: python large_set_arboricity_updated.py")
@@ -9,7 +9,7 @@ Uses igraph's C++ backend for graph operations + NumPy for vectorized computatio
 
 import igraph as ig
 import numpy as np
-import heapq
+import itertools
 import time
 from typing import Tuple, List, Optional
 from numba import njit
@@ -30,6 +30,12 @@ class LargeSetArboricityIgraph:
         self.G = G
         self.n = G.vcount()
         self.m = G.ecount()
+        # CSR adjacency and peel states, built lazily on first use and
+        # reused after; the graph is never mutated through this class
+        self._indptr = None
+        self._indices = None
+        self._deg0 = None
+        self._peel_state = None
     
     @classmethod
     def from_networkx(cls, G_nx):
@@ -42,21 +48,29 @@ class LargeSetArboricityIgraph:
         Returns:
             LargeSetArboricityIgraph instance
         """
-        # Get nodes and create mapping to contiguous IDs
-        nodes = list(G_nx.nodes())
-        n = len(nodes)
-        node_to_idx = {node: i for i, node in enumerate(nodes)}
-        
-        # Convert edges using the mapping
-        edges = list(G_nx.edges())
-        edge_list = [(node_to_idx[u], node_to_idx[v]) for u, v in edges]
-        
-        # Create igraph with correct number of nodes
-        G_ig = ig.Graph(n)
-        if edge_list:
-            G_ig.add_edges(edge_list)
-        
-        return cls(G_ig)
+        n = G_nx.number_of_nodes()
+        m = G_nx.number_of_edges()
+
+        if all(isinstance(v, (int, np.integer)) for v in G_nx.nodes()):
+            # Integer labels: map label -> contiguous ID with a single
+            # searchsorted over the sorted labels instead of two dict
+            # lookups per edge
+            node_ids = np.fromiter(G_nx.nodes(), dtype=np.int64, count=n)
+            node_ids.sort()
+            edges_arr = np.fromiter(
+                itertools.chain.from_iterable(G_nx.edges()),
+                dtype=np.int64, count=2 * m
+            ).reshape(-1, 2)
+            edge_list = np.searchsorted(node_ids, edges_arr).tolist()
+        else:
+            # Arbitrary hashable labels: fall back to the dict mapping
+            node_to_idx = {node: i for i, node in enumerate(G_nx.nodes())}
+            edge_list = [(node_to_idx[u], node_to_idx[v])
+                         for u, v in G_nx.edges()]
+        
+        # One-shot construction lets the C backend size its edge
+        # arrays exactly once
+        return cls(ig.Graph(n=n, edges=edge_list, directed=False))
     
     @classmethod
     def from_edgelist(cls, edges: List[Tuple[int, int]], n: Optional[int] = None):
@@ -70,15 +84,58 @@ class LargeSetArboricityIgraph:
         Returns:
             LargeSetArboricityIgraph instance
         """
-        if n is None:
-            n = max(max(u, v) for u, v in edges) + 1
-        
-        G = ig.Graph(n)
-        if edges:
-            G.add_edges(edges)
-        
-        return cls(G)
-    
+        if n is None and edges:
+            # Single int64 pass instead of a Python double-generator max
+            flat = np.fromiter(itertools.chain.from_iterable(edges),
+                               dtype=np.int64, count=2 * len(edges))
+            n = int(flat.max()) + 1
+        elif n is None:
+            n = 0
+
+        return cls(ig.Graph(n=n, edges=edges, directed=False))
+
+    def _ensure_csr(self) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Build (and cache) the CSR adjacency arrays for the graph.
+
+        The flattening from igraph's adjacency lists is O(n + m); doing
+        it once lets every subsequent dk query skip straight to the
+        compiled peel kernel.
+
+        Returns:
+            (indptr, indices) as int32 NumPy arrays
+        """
+        if self._indptr is None:
+            adj = self.G.get_adjlist()
+            self._indptr = np.fromiter(
+                itertools.accumulate((len(a) for a in adj), initial=0),
+                dtype=np.int32, count=self.n + 1
+            )
+            self._indices = np.fromiter(
+                itertools.chain.from_iterable(adj),
+                dtype=np.int32, count=2 * self.m
+            )
+            # Initial degrees fall out of indptr for free; cached so no
+            # peel ever crosses back into igraph for them
+            self._deg0 = np.diff(self._indptr)
+        return self._indptr, self._indices
+
+    def _run_peel(self) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Run (and cache) the min-degree peel.
+
+        Every public entrypoint reduces over the same per-step state
+        sequence, so one O(n+m) kernel run serves them all.
+
+        Returns:
+            (vertices_at_step, edges_at_step) from _bz_core
+        """
+        if self._peel_state is None:
+            indptr, indices = self._ensure_csr()
+            self._peel_state = _bz_core(indptr, indices, self._deg0,
+                                        self.n)
+        return self._peel_state
+
     def compute_dk(self, k: int, verbose: bool = False) -> int:
         """
         Compute dk(G) = αk(G) for a specific k using optimized heap-based algorithm.
@@ -95,54 +152,23 @@ class LargeSetArboricityIgraph:
             return 0
         if k < 0:
             k = 0
-        
-        # Get degree sequence as NumPy array (FAST: O(n) C++ operation)
-        degrees = np.array(self.G.degree(), dtype=np.int32)
-        
-        # Build heap with (degree, vertex_id) pairs
-        heap = [(degrees[v], v) for v in range(n)]
-        heapq.heapify(heap)
-        
-        # Track removed vertices
-        removed = np.zeros(n, dtype=bool)
-        vertices_remaining = n
-        max_avg_degree = 0.0
-        
-        # Current number of edges
-        edges_remaining = self.m
-        
-        # Remove vertices one by one
-        while heap and vertices_remaining > k:
-            # Get minimum degree vertex
-            deg, v = heapq.heappop(heap)
-            
-            # Skip if already removed (lazy deletion)
-            if removed[v]:
-                continue
-            
-            # Update max average degree BEFORE removing vertex
-            if vertices_remaining > k:
-                avg_degree = (2.0 * edges_remaining) / vertices_remaining
-                max_avg_degree = max(max_avg_degree, avg_degree)
-            
-            # Mark as removed
-            removed[v] = True
-            vertices_remaining -= 1
-            edges_remaining -= deg  # Remove edges incident to v
-            
-            # Update degrees of neighbors (FAST: igraph C++ neighbor lookup)
-            neighbors = self.G.neighbors(v)
-            for u in neighbors:
-                if not removed[u]:
-                    degrees[u] -= 1
-                    # Re-insert with updated degree
-                    heapq.heappush(heap, (degrees[u], u))
-        
-        dk_value = int(np.ceil(max_avg_degree))
-        
+
+        # Reduce over the cached O(n+m) bucket-peel states — no heap,
+        # no per-edge Python
+        vertices_at_step, edges_at_step = self._run_peel()
+
+        # dk = max ceil(2e/v) over peel states with more than k
+        # vertices; integer ceiling division keeps it exact and int-only
+        mask = vertices_at_step > k
+        dk_value = 0
+        if mask.any():
+            v_rem = vertices_at_step[mask].astype(np.int64)
+            scores = (2 * edges_at_step[mask] + v_rem - 1) // v_rem
+            dk_value = int(scores.max())
+
         if verbose:
             print(f"d_{k}(G) = {dk_value}")
-        
+
         return dk_value
     
     def compute_all_dk_optimized(self, verbose: bool = True) -> Tuple[np.ndarray, np.ndarray]:
@@ -169,56 +195,11 @@ class LargeSetArboricityIgraph:
             print(f"Computing all d_k values for graph with n={n}, m={self.m}...")
             start_time = time.time()
         
-        # Get degree sequence as NumPy array
-        degrees = np.array(self.G.degree(), dtype=np.int32)
-        
-        # Build heap
-        heap = [(degrees[v], v) for v in range(n)]
-        heapq.heapify(heap)
-        
-        # Track state at each removal step
-        removed = np.zeros(n, dtype=bool)
-        vertices_at_step = np.zeros(n, dtype=np.int32)
-        edges_at_step = np.zeros(n, dtype=np.int32)
-        
-        vertices_remaining = n
-        edges_remaining = self.m
-        step = 0
-        
-        # Record initial state
-        vertices_at_step[0] = vertices_remaining
-        edges_at_step[0] = edges_remaining
-        
-        # Remove vertices one by one
-        while heap and step < n - 1:
-            deg, v = heapq.heappop(heap)
-            
-            if removed[v]:
-                continue
-            
-            # Remove vertex
-            removed[v] = True
-            vertices_remaining -= 1
-            edges_remaining -= deg
-            
-            # Update neighbor degrees
-            neighbors = self.G.neighbors(v)
-            for u in neighbors:
-                if not removed[u]:
-                    degrees[u] -= 1
-                    heapq.heappush(heap, (degrees[u], u))
-            
-            # Record state after removal
-            step += 1
-            vertices_at_step[step] = vertices_remaining
-            edges_at_step[step] = edges_remaining
-        
+        # Single O(n+m) bucket peel records the full state sequence
+        vertices_at_step, edges_at_step = self._run_peel()
+
         # Now compute all dk values using recorded states
-        dk_values = _compute_dk_from_states(
-            vertices_at_step[:step+1],
-            edges_at_step[:step+1],
-            n
-        )
+        dk_values = _compute_dk_from_states(vertices_at_step, edges_at_step, n)
         
         if verbose:
             elapsed = time.time() - start_time
@@ -280,8 +261,97 @@ class LargeSetArboricityIgraph:
         }
 
 
-@njit
-def _compute_dk_from_states(vertices_at_step: np.ndarray, 
+@njit('Tuple((int32[:], int64[:]))(int32[:], int32[:], int32[:], int64)',
+      cache=True, nogil=True)
+def _bz_core(indptr, indices, deg0, n):
+    """
+    Min-degree peel over CSR arrays, Batagelj–Zaveršnik style.
+
+    Vertices are bucket-sorted by degree into a flat `vert` array with
+    `pos` (vertex -> position) and `bin_start` (degree -> first position
+    of that degree). Popping the next vertex is an array read; each
+    neighbor update swaps the neighbor to the front of its bin and
+    shrinks the bin, so the whole peel is O(n + m) with no heap and no
+    lazy deletions.
+
+    Returns:
+        (vertices_at_step, edges_at_step): remaining vertex/edge counts
+        recorded after each removal, with step 0 the initial state.
+    """
+    vertices_at_step = np.zeros(n, np.int32)
+    edges_at_step = np.zeros(n, np.int64)
+    if n == 0:
+        return vertices_at_step, edges_at_step
+
+    # Work on a copy: the peel decrements degrees in place while the
+    # caller keeps deg0 as the pristine initial-degree array
+    deg = deg0.copy()
+    max_deg = 0
+    for v in range(n):
+        if deg[v] > max_deg:
+            max_deg = deg[v]
+    m = indices.shape[0] // 2
+
+    # Counting sort by degree: vert holds vertices grouped by degree,
+    # bin_start[d] is the position of the first vertex with degree d
+    bin_start = np.zeros(max_deg + 2, np.int32)
+    for v in range(n):
+        bin_start[deg[v] + 1] += 1
+    for d in range(1, max_deg + 2):
+        bin_start[d] += bin_start[d - 1]
+
+    vert = np.empty(n, np.int32)
+    pos = np.empty(n, np.int32)
+    fill = bin_start.copy()
+    for v in range(n):
+        p = fill[deg[v]]
+        vert[p] = v
+        pos[v] = p
+        fill[deg[v]] += 1
+
+    edges_remaining = m
+    vertices_at_step[0] = n
+    edges_at_step[0] = m
+
+    for i in range(n):
+        v = vert[i]
+        dv = deg[v]
+        if dv == n - i - 1:
+            # Minimum degree equals remaining vertices minus one: the
+            # residual graph is a clique, so every later state follows
+            # the closed form and the rest of the peel can be skipped
+            for t in range(i + 1, n):
+                r = np.int64(n - t)
+                vertices_at_step[t] = r
+                edges_at_step[t] = (r * (r - 1)) // 2
+            return vertices_at_step, edges_at_step
+        # v sits at the front of the minimum bin; consume it
+        bin_start[dv] = i + 1
+        edges_remaining -= dv
+
+        for j in range(indptr[v], indptr[v + 1]):
+            u = indices[j]
+            if pos[u] > i:
+                du = deg[u]
+                pw = bin_start[du]
+                w = vert[pw]
+                if u != w:
+                    vert[pw] = u
+                    vert[pos[u]] = w
+                    pos[w] = pos[u]
+                    pos[u] = pw
+                bin_start[du] = pw + 1
+                deg[u] = du - 1
+
+        if i + 1 < n:
+            vertices_at_step[i + 1] = n - (i + 1)
+            edges_at_step[i + 1] = edges_remaining
+
+    return vertices_at_step, edges_at_step
+
+
+@njit('int32[:](int32[:], int64[:], int64)', cache=True, nogil=True)
+def _compute_dk_from_states(vertices_at_step: np.ndarray,
                             edges_at_step: np.ndarray,
                             n: int) -> np.ndarray:
     """
@@ -296,28 +366,33 @@ def _compute_dk_from_states(vertices_at_step: np.ndarray,
         vertices_at_step: Array of vertex counts at each step
         edges_at_step: Array of edge counts at each step
         n: Total number of vertices
-        
+
     Returns:
         Array of dk values for k=0 to n-1
     """
     num_steps = len(vertices_at_step)
+
+    # Best ceil(avg degree) seen at each exact remaining-vertex count.
+    # ceil is monotone, so max-then-ceil equals ceil-per-state-then-max;
+    # (2e + v - 1) // v is the exact integer ceiling, no FP involved.
+    best_for_v = np.zeros(n + 1, dtype=np.int32)
+    for step in range(num_steps):
+        vertices = vertices_at_step[step]
+        if vertices > 0:
+            score = np.int32((2 * edges_at_step[step] + vertices - 1)
+                             // vertices)
+            if score > best_for_v[vertices]:
+                best_for_v[vertices] = score
+
+    # dk(k) ranges over states with vertices > k, so a single downward
+    # sweep with a running max covers every k in O(n) total.
     dk_values = np.zeros(n, dtype=np.int32)
-    
-    for k in range(n):
-        max_avg_degree = 0.0
-        
-        # Find max average degree among steps where vertices > k
-        for step in range(num_steps):
-            vertices = vertices_at_step[step]
-            edges = edges_at_step[step]
-            
-            if vertices > k and vertices > 0:
-                avg_degree = (2.0 * edges) / vertices
-                if avg_degree > max_avg_degree:
-                    max_avg_degree = avg_degree
-        
-        dk_values[k] = int(np.ceil(max_avg_degree))
-    
+    running = 0
+    for v in range(n, 0, -1):
+        if best_for_v[v] > running:
+            running = best_for_v[v]
+        dk_values[v - 1] = running
+
     return dk_values
 
 
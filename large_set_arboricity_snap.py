@@ -9,13 +9,272 @@ Key optimizations:
 3. Adjacency list caching for fast neighbor access
 """
 
+import heapq
+
 import networkx as nx
-import math
+import numpy as np
+import os
+from multiprocessing import Pool
 from typing import Tuple, List, Optional
-from itertools import combinations
-import heapq
 import time
 
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+
+def _iterate_bits(mask: int):
+    """Yield the set bit positions of a Python-int bitmask."""
+    while mask:
+        low = mask & -mask
+        yield low.bit_length() - 1
+        mask ^= low
+
+
+def _exact_dfs_python(adj_bits, n, k, v, S, size, edges, best_alpha, best_mask):
+    """
+    Pure-Python fallback for _exact_dfs (used when Numba is unavailable).
+
+    Include/exclude DFS over vertices maintaining (S, |S|, edge count)
+    incrementally; every subset is evaluated exactly once, when its
+    largest vertex is added.
+    """
+    if v == n:
+        return best_alpha, best_mask
+    # Branch-and-bound: no extension can average more than a complete
+    # graph on every reachable vertex, nor exceed the max attainable
+    # edge count spread over the smallest admissible subset size
+    r = n - v
+    e_max = edges + (r * (r - 1)) // 2 + r * size
+    upper = min(size + r - 1, (2 * e_max + k) // (k + 1))
+    if upper <= best_alpha:
+        return best_alpha, best_mask
+    best_alpha, best_mask = _exact_dfs_python(
+        adj_bits, n, k, v + 1, S, size, edges, best_alpha, best_mask)
+    edges2 = edges + (adj_bits[v] & S).bit_count()
+    S2 = S | (1 << v)
+    size2 = size + 1
+    if size2 > k and edges2 > 0:
+        alpha = (2 * edges2 + size2 - 1) // size2
+        if alpha > best_alpha:
+            best_alpha = alpha
+            best_mask = S2
+    return _exact_dfs_python(
+        adj_bits, n, k, v + 1, S2, size2, edges2, best_alpha, best_mask)
+
+
+def _exact_dfs_task(adj_bits_list, n, k, n_free, prefix, seed_alpha):
+    """
+    Worker for the parallel exact search: run the DFS over the free
+    vertices 0..n_free-1 with the top vertices fixed to `prefix`.
+
+    The pure-prefix subset itself is evaluated here, since the DFS only
+    evaluates subsets when a free vertex is added.
+    """
+    # The njit kernel wants a typed array; the Python fallback keeps the
+    # plain-int list (np.int64 grows bit_count only in numpy >= 2)
+    if NUMBA_AVAILABLE:
+        adj_bits = np.array(adj_bits_list, dtype=np.int64)
+    else:
+        adj_bits = adj_bits_list
+
+    best_alpha, best_mask = seed_alpha, 0
+
+    # Size and internal edge count of the fixed prefix, built incrementally
+    S = 0
+    size = 0
+    edges = 0
+    for v in _iterate_bits(prefix):
+        edges += (adj_bits_list[v] & S).bit_count()
+        S |= 1 << v
+        size += 1
+
+    if size > k and edges > 0:
+        alpha = (2 * edges + size - 1) // size
+        if alpha > best_alpha:
+            best_alpha = alpha
+            best_mask = S
+
+    return _exact_dfs(adj_bits, n_free, k, 0, S, size, edges,
+                      best_alpha, best_mask)
+
+
+def _peel_csr_python(indptr, indices, degrees):
+    """
+    Pure-Python fallback peel (used when Numba is unavailable).
+
+    Min-heap of (degree, id) with lazy deletion: entries staled by a
+    degree decrement are skipped on pop, so ties on degree always
+    resolve to the lowest vertex id — the same selection the reference
+    dict-scan in modified_degeneracy_algorithm makes.
+
+    Returns:
+        (removal_order, degree_at_removal_by_step) with removal_order as
+        internal vertex IDs
+    """
+    n = degrees.shape[0]
+    removed = np.zeros(n, dtype=bool)
+    removal_order = np.empty(n, dtype=np.int32)
+    degree_at_removal_by_step = np.empty(n, dtype=np.int32)
+
+    heap = [(int(degrees[v]), v) for v in range(n)]
+    heapq.heapify(heap)
+    for step in range(n):
+        while True:
+            d, v = heapq.heappop(heap)
+            if not removed[v] and d == degrees[v]:
+                break
+
+        removed[v] = True
+        removal_order[step] = v
+        degree_at_removal_by_step[step] = d
+
+        for i in range(indptr[v], indptr[v + 1]):
+            u = indices[i]
+            if not removed[u]:
+                degrees[u] -= 1
+                heapq.heappush(heap, (int(degrees[u]), int(u)))
+
+    return removal_order, degree_at_removal_by_step
+
+
+if NUMBA_AVAILABLE:
+    # Lazily compiled (cache=True) so the kernel specializes once per
+    # degree dtype (uint8/uint16/int32) chosen at construction time
+    @njit(cache=True, nogil=True)
+    def _peel_csr(indptr, indices, degrees):
+        """
+        Numba kernel: lazy-deletion min-heap peel over CSR arrays.
+
+        Heap entries encode (degree, vertex) as degree * n + vertex, so
+        pops come out in (degree, id) order and ties on degree always
+        resolve to the lowest vertex id — the same selection the
+        reference dict-scan in modified_degeneracy_algorithm makes.
+        Entries staled by a degree decrement are skipped on pop.
+
+        Returns:
+            (removal_order, degree_at_removal_by_step) with removal_order
+            as internal vertex IDs
+        """
+        n = np.int64(degrees.shape[0])
+        removal_order = np.empty(n, dtype=np.int32)
+        degree_at_removal_by_step = np.empty(n, dtype=np.int32)
+        if n == 0:
+            return removal_order, degree_at_removal_by_step
+
+        # One slot per initial vertex plus one per undirected edge: each
+        # edge decrements its surviving endpoint at most once
+        heap = np.empty(n + indices.shape[0] // 2 + 1, dtype=np.int64)
+        size = 0
+        for v in range(n):
+            key = np.int64(degrees[v]) * n + v
+            i = size
+            size += 1
+            while i > 0:
+                parent = (i - 1) >> 1
+                if heap[parent] <= key:
+                    break
+                heap[i] = heap[parent]
+                i = parent
+            heap[i] = key
+
+        # Removal mask packed 64 vertices per uint64 word: 8x smaller
+        # than a byte mask, so it stays cache-resident on large graphs
+        removed_bits = np.zeros((n + 63) >> 6, dtype=np.uint64)
+
+        for step in range(n):
+            while True:
+                key = heap[0]
+                # Pop the root, sift the last entry back down
+                size -= 1
+                last = heap[size]
+                i = 0
+                while True:
+                    c = 2 * i + 1
+                    if c >= size:
+                        break
+                    if c + 1 < size and heap[c + 1] < heap[c]:
+                        c += 1
+                    if heap[c] >= last:
+                        break
+                    heap[i] = heap[c]
+                    i = c
+                heap[i] = last
+
+                v = np.int32(key % n)
+                d = key // n
+                if (not (removed_bits[v >> 6] >> np.uint64(v & 63))
+                        & np.uint64(1)) and d == degrees[v]:
+                    break
+
+            removed_bits[v >> 6] |= np.uint64(1) << np.uint64(v & 63)
+            removal_order[step] = v
+            degree_at_removal_by_step[step] = d
+
+            for i in range(indptr[v], indptr[v + 1]):
+                u = indices[i]
+                if not (removed_bits[u >> 6] >> np.uint64(u & 63)) & np.uint64(1):
+                    du = degrees[u] - 1
+                    degrees[u] = du
+                    key = np.int64(du) * n + u
+                    j = size
+                    size += 1
+                    while j > 0:
+                        parent = (j - 1) >> 1
+                        if heap[parent] <= key:
+                            break
+                        heap[j] = heap[parent]
+                        j = parent
+                    heap[j] = key
+
+        return removal_order, degree_at_removal_by_step
+
+    @njit('int64(int64)', cache=True, nogil=True)
+    def _popcount64(x):
+        x = x - ((x >> 1) & 0x5555555555555555)
+        x = (x & 0x3333333333333333) + ((x >> 2) & 0x3333333333333333)
+        x = (x + (x >> 4)) & 0x0F0F0F0F0F0F0F0F
+        return (x * 0x0101010101010101) >> 56
+
+    @njit('Tuple((int64, int64))(int64[::1], int64, int64, int64, int64, '
+          'int64, int64, int64, int64)', cache=True, nogil=True)
+    def _exact_dfs(adj_bits, n, k, v, S, size, edges, best_alpha, best_mask):
+        """
+        Numba kernel: include/exclude DFS over vertices maintaining
+        (S, |S|, edge count) incrementally; every subset is evaluated
+        exactly once, when its largest vertex is added.
+        """
+        if v == n:
+            return best_alpha, best_mask
+        # Branch-and-bound: no extension can average more than a
+        # complete graph on every reachable vertex, nor exceed the max
+        # attainable edge count over the smallest admissible subset size
+        r = n - v
+        e_max = edges + (r * (r - 1)) // 2 + r * size
+        upper = size + r - 1
+        cap = (2 * e_max + k) // (k + 1)
+        if cap < upper:
+            upper = cap
+        if upper <= best_alpha:
+            return best_alpha, best_mask
+        best_alpha, best_mask = _exact_dfs(
+            adj_bits, n, k, v + 1, S, size, edges, best_alpha, best_mask)
+        edges2 = edges + _popcount64(adj_bits[v] & S)
+        S2 = S | (np.int64(1) << v)
+        size2 = size + 1
+        if size2 > k and edges2 > 0:
+            alpha = (2 * edges2 + size2 - 1) // size2
+            if alpha > best_alpha:
+                best_alpha = alpha
+                best_mask = S2
+        return _exact_dfs(
+            adj_bits, n, k, v + 1, S2, size2, edges2, best_alpha, best_mask)
+else:
+    _peel_csr = _peel_csr_python
+    _exact_dfs = _exact_dfs_python
+
 
 class LargeSetArboricityOptimized:
     """
@@ -26,23 +285,119 @@ class LargeSetArboricityOptimized:
     
     where d̄[G'] is the average degree of subgraph G'.
     """
-    
+
+    __slots__ = ('G', 'n', 'nodes', 'node_to_id', 'indptr', 'indices',
+                 'adj_bits', '_deg_dtype', '_peel_cache',
+                 '_last_removal_order')
+
     def __init__(self, G: nx.Graph):
         """Initialize with a NetworkX graph"""
-        self.G = G.copy()
+        # Hold a reference only; every mutating path copies for itself
+        # (modified_degeneracy_algorithm peels its own H = self.G.copy())
+        self.G = G
         self.n = G.number_of_nodes()
-        # Cache adjacency for faster access
-        self.adj = {v: set(G.neighbors(v)) for v in G.nodes()}
-    
+        # Relabel nodes to contiguous IDs 0..n-1 for array indexing
+        self.nodes = list(G.nodes())
+        self.node_to_id = {v: i for i, v in enumerate(self.nodes)}
+        # Build CSR adjacency (indptr, indices) once instead of dict-of-sets
+        self.indptr, self.indices = self._build_csr(G)
+        # Bitset adjacency (bit u of adj_bits[v] set iff (v,u) is an
+        # edge): deferred to first exact-search use — the masks cost
+        # O(n^2) bits, and only n <= 15 graphs ever need them
+        self.adj_bits = None
+        # Narrowest dtype that holds every degree: smaller working arrays
+        # mean more of the peel state stays cache-resident
+        max_deg = int(np.diff(self.indptr).max()) if self.n else 0
+        if max_deg < 256:
+            self._deg_dtype = np.uint8
+        elif max_deg < 65536:
+            self._deg_dtype = np.uint16
+        else:
+            self._deg_dtype = np.int32
+        # Peel output is k-independent; computed once on demand (the
+        # instance exposes no mutators, so it never goes stale)
+        self._peel_cache = None
+
+    def _build_adj_bits(self) -> List[int]:
+        """Build one Python-int neighbor bitmask per vertex from the CSR."""
+        if self.adj_bits is None:
+            indptr, indices = self.indptr, self.indices
+            adj_bits = [0] * self.n
+            for v in range(self.n):
+                bits = 0
+                for i in range(indptr[v], indptr[v + 1]):
+                    bits |= 1 << int(indices[i])
+                adj_bits[v] = bits
+            self.adj_bits = adj_bits
+        return self.adj_bits
+
+    def _build_csr(self, G: nx.Graph) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Build CSR adjacency arrays from the graph.
+
+        Returns:
+            (indptr, indices): indptr[v]..indptr[v+1] indexes v's neighbors
+        """
+        n = self.n
+        node_to_id = self.node_to_id
+
+        # First pass: count degrees, prefix-sum into indptr
+        degrees = np.zeros(n, dtype=np.int32)
+        for u, v in G.edges():
+            degrees[node_to_id[u]] += 1
+            degrees[node_to_id[v]] += 1
+
+        indptr = np.zeros(n + 1, dtype=np.int32)
+        np.cumsum(degrees, out=indptr[1:])
+
+        # Second pass: write both directions of each edge
+        indices = np.empty(indptr[n], dtype=np.int32)
+        cursor = indptr[:n].copy()
+        for u, v in G.edges():
+            ui, vi = node_to_id[u], node_to_id[v]
+            indices[cursor[ui]] = vi
+            cursor[ui] += 1
+            indices[cursor[vi]] = ui
+            cursor[vi] += 1
+
+        return indptr, indices
+
+    def all_dk(self) -> np.ndarray:
+        """
+        Compute dk(G) for EVERY k in one pass.
+
+        One peel yields the per-step removal degrees; dk(k) is the max of
+        the last k of them, so all values fall out of a single
+        right-to-left running max.
+
+        Returns:
+            int32 array out of length n+1 where out[k] = dk(G, k)
+        """
+        n = self.n
+        if self._peel_cache is None:
+            # Working degree array (CSR is never mutated; removals are lazy)
+            degrees = np.diff(self.indptr).astype(self._deg_dtype)
+            removal_order, rem_deg_by_step = _peel_csr(
+                self.indptr, self.indices, degrees)
+            self._last_removal_order = [self.nodes[v] for v in removal_order]
+            self._peel_cache = rem_deg_by_step
+        rem_deg_by_step = self._peel_cache
+
+        out = np.zeros(n + 1, dtype=np.int32)
+        if n > 0:
+            out[1:] = np.maximum.accumulate(rem_deg_by_step[::-1])
+        return out
+
     def modified_degeneracy_algorithm_optimized(self, k: int) -> Tuple[int, List[int]]:
         """
-        OPTIMIZED Modified Degeneracy Algorithm using min-heap
-        
-        Complexity: O(m log n) instead of O(n²m)
-        
+        OPTIMIZED Modified Degeneracy Algorithm: Numba-compiled peel over CSR
+
+        Complexity: O((n+m) log n) for the peel; the per-k answer is a
+        slice of the fused all-k result.
+
         Args:
             k: Parameter (size of large set)
-        
+
         Returns:
             (dk_value, removal_order)
         """
@@ -51,56 +406,9 @@ class LargeSetArboricityOptimized:
             k = n
         if k <= 0:
             return 0, []
-        
-        # Build adjacency list (mutable copy)
-        neighbors = {v: set(self.adj[v]) for v in self.G.nodes()}
-        
-        # Initialize heap with (degree, vertex) pairs
-        degrees = {v: len(neighbors[v]) for v in self.G.nodes()}
-        heap = [(degrees[v], v) for v in self.G.nodes()]
-        heapq.heapify(heap)
-        
-        removed = set()
-        removal_order = []
-        degree_at_removal = {}
-        
-        # Remove vertices one by one
-        while heap:
-            # Get minimum degree vertex
-            deg, v = heapq.heappop(heap)
-            
-            # Skip if already removed (lazy deletion)
-            if v in removed:
-                continue
-            
-            # Current actual degree (may have changed)
-            actual_deg = degrees[v]
-            if deg < actual_deg:
-                # Degree increased, re-insert with correct degree
-                heapq.heappush(heap, (actual_deg, v))
-                continue
-            
-            # Remove vertex
-            removed.add(v)
-            removal_order.append(v)
-            degree_at_removal[v] = actual_deg
-            
-            # Update neighbors' degrees
-            for u in neighbors[v]:
-                if u not in removed:
-                    neighbors[u].discard(v)
-                    degrees[u] -= 1
-                    # Push updated degree (lazy deletion handles duplicates)
-                    heapq.heappush(heap, (degrees[u], u))
-            
-            # Clear v's neighbors
-            neighbors[v].clear()
-        
-        # dk(G) = max degree in last k vertices
-        last_k = removal_order[-k:] if k <= len(removal_order) else removal_order
-        dk_value = max(degree_at_removal[v] for v in last_k) if last_k else 0
-        
-        return dk_value, removal_order
+
+        dk_value = int(self.all_dk()[k])
+        return dk_value, self._last_removal_order
     
     def modified_degeneracy_algorithm(self, k: int) -> Tuple[int, List[int]]:
         """Original algorithm for comparison"""
@@ -111,63 +419,101 @@ class LargeSetArboricityOptimized:
             return 0, []
         
         H = self.G.copy()
+        # Edit the raw adjacency dict directly: H.remove_node/H.degree go
+        # through AdjacencyView creation and method dispatch per call
+        adj = H._adj
+        # Match H.degree(v): a self-loop contributes 2, but appears in
+        # adj[v] as a single key
+        degrees = {v: len(adj[v]) + (v in adj[v]) for v in adj}
         removal_order = []
-        degree_at_removal = {}
-        
+        # Per-step int32 array instead of a dict of boxed Python ints
+        degree_at_removal_by_step = np.zeros(n, dtype=np.int32)
+        steps = 0
+
         # Remove vertices one by one (minimum degree first)
         for step in range(n):
-            if H.number_of_nodes() == 0:
+            if not degrees:
                 break
-            
+
             # Find minimum degree vertex - O(n) scan
-            min_deg = float('inf')
-            min_vertex = None
-            for v in H.nodes():
-                deg = H.degree(v)
-                if deg < min_deg:
-                    min_deg = deg
-                    min_vertex = v
-            
+            min_vertex = min(degrees, key=degrees.__getitem__)
+            min_deg = degrees[min_vertex]
+
             # Record and remove
             removal_order.append(min_vertex)
-            degree_at_removal[min_vertex] = min_deg
-            H.remove_node(min_vertex)
-        
-        # dk(G) = max degree in last k vertices
-        last_k = removal_order[-k:] if k <= len(removal_order) else removal_order
-        dk_value = max(degree_at_removal[v] for v in last_k) if last_k else 0
-        
+            degree_at_removal_by_step[step] = min_deg
+            steps += 1
+            vnbrs = adj.pop(min_vertex)
+            for u in vnbrs:
+                if u != min_vertex:  # self-loop: its dict was just popped
+                    adj[u].pop(min_vertex, None)
+                    degrees[u] -= 1
+            del degrees[min_vertex]
+
+        # dk(G) = max degree in last k vertices (SIMD reduction)
+        lo = max(0, steps - k)
+        dk_value = int(degree_at_removal_by_step[lo:steps].max()) if steps else 0
+
         return dk_value, removal_order
     
-    def compute_alpha_k_exact(self, k: int) -> Tuple[int, Optional[nx.Graph]]:
+    def compute_alpha_k_exact(self, k: int,
+                              parallel: bool = False) -> Tuple[int, Optional[nx.Graph]]:
         """
         Compute exact αk(G) by checking all subgraphs with |V| > k
         WARNING: Exponential time! Only works for small graphs (n ≤ 15)
+
+        Subsets are enumerated by an include/exclude DFS over bitmasks
+        that carries (subset, size, edge count) incrementally, so each
+        subset costs O(1) amortized instead of an O(|S|) edge recount.
+
+        Args:
+            k: Parameter
+            parallel: Partition the subset space across a process pool
+                (only pays off near the n=15 ceiling; default serial)
         """
         n = self.n
         if n <= k:
             return 0, None
-        
+
         if n > 15:
             print(f"Warning: Graph too large (n={n}) for exact αk computation")
             return None, None
-        
-        nodes = list(self.G.nodes())
-        max_alpha = 0
-        best_subgraph = None
-        
-        # Check all subsets of size > k
-        for size in range(k + 1, n + 1):
-            for subset in combinations(nodes, size):
-                subgraph = self.G.subgraph(subset)
-                if subgraph.number_of_nodes() > 0 and subgraph.number_of_edges() > 0:
-                    avg_deg = 2 * subgraph.number_of_edges() / subgraph.number_of_nodes()
-                    alpha_val = math.ceil(avg_deg)
-                    if alpha_val > max_alpha:
-                        max_alpha = alpha_val
-                        best_subgraph = subgraph.copy()
-        
-        return max_alpha, best_subgraph
+
+        # Seed with 0: this class's dk (max removal degree over the last
+        # k removals) is NOT a lower bound on αk, so a dk-derived seed
+        # can prune the true optimum away (e.g. K3 plus isolated
+        # vertices). The branch-and-bound still prunes against the best
+        # value found so far.
+        adj_bits_list = self._build_adj_bits()
+
+        if parallel and n > 4:
+            # Fix the top vertices to every possible prefix: the subset
+            # space splits into independent, embarrassingly parallel tasks
+            n_procs = os.cpu_count() or 1
+            p = max(1, min(n - 1, (2 * n_procs - 1).bit_length()))
+            n_free = n - p
+            tasks = [(adj_bits_list, n, k, n_free, prefix << n_free, 0)
+                     for prefix in range(1 << p)]
+            with Pool() as pool:
+                results = pool.starmap(_exact_dfs_task, tasks)
+            best_alpha, best_mask = max(results)
+        else:
+            if NUMBA_AVAILABLE:
+                adj_bits = np.array(adj_bits_list, dtype=np.int64)
+            else:
+                # np.int64 grows bit_count only in numpy >= 2; the
+                # fallback runs on the plain-int list instead
+                adj_bits = adj_bits_list
+            best_alpha, best_mask = _exact_dfs(
+                adj_bits, n, k, 0, 0, 0, 0, 0, 0)
+
+        if not best_mask:
+            return 0, None
+
+        best_nodes = [self.nodes[v] for v in _iterate_bits(int(best_mask))]
+        best_subgraph = self.G.subgraph(best_nodes).copy()
+
+        return int(best_alpha), best_subgraph
     
     def verify_approximation(self, k: int, use_optimized: bool = True) -> dict:
         """
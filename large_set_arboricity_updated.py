@@ -4,11 +4,119 @@ Large-Set-Arboricity Algorithms
 Based on: "My notes for prove approximate for large-Set-Arboricity" by Amit Perelman
 """
 
+import hashlib
+import heapq
+import os
+
 import networkx as nx
-import math
-import matplotlib.pyplot as plt
+import numpy as np
 from typing import Tuple, List, Optional
-from itertools import combinations
+
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+
+if NUMBA_AVAILABLE:
+    @njit(cache=True, nogil=True)
+    def _peel_min_degree(indptr, indices, deg):
+        """
+        Native min-degree peel over CSR arrays.
+
+        Lazy-deletion min-heap with entries encoding (degree, vertex) as
+        degree * n + vertex: pops come out in (degree, id) order, so
+        ties on minimum degree always resolve to the lowest vertex id —
+        the same selection the pure-Python heapq fallback (and the
+        original argmin scan) makes. Entries staled by a decrement are
+        skipped on pop; the peel is O((n + m) log n).
+
+        Returns:
+            (order, deg_at_removal): vertex ids in removal order and the
+            degree each vertex had when removed, both int32[n].
+        """
+        n = np.int64(deg.shape[0])
+        order = np.empty(n, np.int32)
+        deg_at_removal = np.empty(n, np.int32)
+        if n == 0:
+            return order, deg_at_removal
+
+        degw = deg.copy()
+        # One slot per initial vertex plus one per undirected edge: each
+        # edge decrements its surviving endpoint at most once
+        heap = np.empty(n + indices.shape[0] // 2 + 1, np.int64)
+        size = 0
+        for v in range(n):
+            key = np.int64(degw[v]) * n + v
+            i = size
+            size += 1
+            while i > 0:
+                parent = (i - 1) >> 1
+                if heap[parent] <= key:
+                    break
+                heap[i] = heap[parent]
+                i = parent
+            heap[i] = key
+
+        # Liveness packed 64 vertices per word: 8x smaller than a byte
+        # mask, so it stays cache-resident on large graphs
+        alive_bits = np.zeros((n + 63) >> 6, np.uint64)
+        for v in range(n):
+            alive_bits[v >> 6] |= np.uint64(1) << np.uint64(v & 63)
+
+        for step in range(n):
+            while True:
+                key = heap[0]
+                # Pop the root, sift the last entry back down
+                size -= 1
+                last = heap[size]
+                i = 0
+                while True:
+                    c = 2 * i + 1
+                    if c >= size:
+                        break
+                    if c + 1 < size and heap[c + 1] < heap[c]:
+                        c += 1
+                    if heap[c] >= last:
+                        break
+                    heap[i] = heap[c]
+                    i = c
+                heap[i] = last
+
+                v = np.int32(key % n)
+                d = key // n
+                if ((alive_bits[v >> 6] >> np.uint64(v & 63)) & np.uint64(1)
+                        and d == degw[v]):
+                    break
+
+            order[step] = v
+            deg_at_removal[step] = d
+            alive_bits[v >> 6] &= ~(np.uint64(1) << np.uint64(v & 63))
+
+            for j in range(indptr[v], indptr[v + 1]):
+                u = indices[j]
+                if (alive_bits[u >> 6] >> np.uint64(u & 63)) & np.uint64(1):
+                    du = degw[u] - 1
+                    degw[u] = du
+                    key = np.int64(du) * n + u
+                    i = size
+                    size += 1
+                    while i > 0:
+                        parent = (i - 1) >> 1
+                        if heap[parent] <= key:
+                            break
+                        heap[i] = heap[parent]
+                        i = parent
+                    heap[i] = key
+
+        return order, deg_at_removal
+
+    # Warm the JIT at import so the first analysis call doesn't stall
+    # (cache=True makes this a disk load after the first ever run)
+    _peel_min_degree(np.array([0, 1, 2], np.int32),
+                     np.array([1, 0], np.int32),
+                     np.array([1, 1], np.int32))
 
 
 class LargeSetArboricity:
@@ -20,58 +128,152 @@ class LargeSetArboricity:
     
     where d̄[G'] is the average degree of subgraph G'.
     """
-    
-    def __init__(self, G: nx.Graph):
-        """Initialize with a NetworkX graph"""
-        self.G = G.copy()
+
+    __slots__ = ('G', 'n', 'nodes', 'node_to_id', 'indptr', 'indices',
+                 '_deg0', '_adj_bits', '_subset_edges', '_subset_sizes',
+                 '_dk_cache', '_alpha_exact_cache', '_alpha_removal_cache',
+                 '_peel_cache', '_peel_cache_dir')
+
+    def __init__(self, G: nx.Graph, peel_cache_dir: Optional[str] = None):
+        """
+        Initialize with a NetworkX graph.
+
+        Args:
+            G: Input graph
+            peel_cache_dir: Optional directory for persisting peel
+                traces to disk (.npz keyed by a hash of the adjacency),
+                so re-analyzing the same dataset across runs skips the
+                peel entirely
+
+        The graph is treated as read-only: nodes are relabelled to
+        0..n-1 and the adjacency is snapshotted once into CSR arrays
+        (indptr, indices), so a vertex's neighbors are a contiguous
+        int32 slice instead of a dict-of-dict walk. The peels never
+        mutate these arrays — removed vertices are skipped via a
+        boolean mask at iteration time.
+        """
+        self.G = G
         self.n = G.number_of_nodes()
+        self.nodes = list(G.nodes())
+        self.node_to_id = {v: i for i, v in enumerate(self.nodes)}
+        if self.n > 0:
+            A = nx.to_scipy_sparse_array(G, nodelist=self.nodes,
+                                         format='csr', dtype=np.int8)
+            self.indptr = A.indptr.astype(np.int32)
+            self.indices = A.indices.astype(np.int32)
+        else:
+            self.indptr = np.zeros(1, dtype=np.int32)
+            self.indices = np.zeros(0, dtype=np.int32)
+        self._deg0 = np.diff(self.indptr).astype(np.int32)
+        # Bitset rows and per-subset tables for the exact search; built
+        # on first use since only small graphs (n <= 15) ever reach it
+        self._adj_bits = None
+        self._subset_edges = None
+        self._subset_sizes = None
+        # Per-k memo caches: analysis drivers call the same k repeatedly
+        # and the graph snapshot above never changes after construction
+        self._dk_cache = {}
+        self._alpha_exact_cache = {}
+        self._alpha_removal_cache = {}
+        # The peel trace is k-independent: computed once, shared by all
+        # per-k queries
+        self._peel_cache = None
+        self._peel_cache_dir = peel_cache_dir
     
     def modified_degeneracy_algorithm(self, k: int) -> Tuple[int, List[int]]:
         """
         Modified Degeneracy Algorithm
-        Computes dk(G) = max degree in last k vertices removed
-        
+        Computes dk(G) = max degree at removal over the first n-k
+        removals, i.e. while more than k vertices remain. This is the
+        quantity the approximation proof sandwiches:
+        dk(G) ≤ αk(G) ≤ 2·dk(G).
+
         Args:
             k: Parameter (size of large set)
-        
+
         Returns:
             (dk_value, removal_order)
         """
         n = self.n
-        if k > n:
-            k = n
-        if k <= 0:
+        k = min(max(k, 0), n)
+        if n == 0:
             return 0, []
-        
-        H = self.G.copy()
-        removal_order = []
-        degree_at_removal = {}
-        
-        # Remove vertices one by one (minimum degree first)
-        for step in range(n):
-            if H.number_of_nodes() == 0:
-                break
-            
-            # Find minimum degree vertex
-            min_deg = float('inf')
-            min_vertex = None
-            for v in H.nodes():
-                deg = H.degree(v)
-                if deg < min_deg:
-                    min_deg = deg
-                    min_vertex = v
-            
-            # Record and remove
-            removal_order.append(min_vertex)
-            degree_at_removal[min_vertex] = min_deg
-            H.remove_node(min_vertex)
-        
-        # dk(G) = max degree in last k vertices
-        last_k = removal_order[-k:] if k <= len(removal_order) else removal_order
-        dk_value = max(degree_at_removal[v] for v in last_k) if last_k else 0
-        
+        if k in self._dk_cache:
+            return self._dk_cache[k]
+
+        # One peel serves every k; dk is a slice max over its record
+        removal_order, degree_at_removal, _ = self._peel_full()
+
+        # dk(G) = max degree among the first n-k removals
+        take = n - k
+        dk_value = int(degree_at_removal[:take].max()) if take > 0 else 0
+
+        self._dk_cache[k] = (dk_value, removal_order)
         return dk_value, removal_order
     
+    def modified_degeneracy_batch(self, max_k: int) -> np.ndarray:
+        """
+        Compute dk(G) for every k in 0..max_k from ONE peel.
+
+        The removal order does not depend on k, so instead of re-running
+        the peel per k, dk(k) is read off as the prefix maximum of the
+        per-step removal degrees over the first n-k steps.
+
+        Args:
+            max_k: Largest k to report (clamped to n)
+
+        Returns:
+            int64 array of length max_k+1 with entry k equal to dk(G)
+        """
+        n = self.n
+        max_k = min(max_k, n)
+        dk_arr = np.zeros(max(max_k, 0) + 1, dtype=np.int64)
+        if n == 0 or max_k < 0:
+            return dk_arr
+
+        _, degree_at_removal, _ = self._peel_full()
+        # prefix_max[j] = max degree among the first j+1 removals, and
+        # dk(k) considers the first n-k of them
+        prefix_max = np.maximum.accumulate(degree_at_removal)
+        counts = n - np.arange(max_k + 1)
+        valid = counts > 0
+        dk_arr[valid] = prefix_max[counts[valid] - 1]
+        return dk_arr
+
+    def compute_alpha_k_batch(self, max_k: int) -> np.ndarray:
+        """
+        Compute the removal-algorithm αk(G) for every k in 0..max_k
+        from ONE peel.
+
+        A peel state with v remaining vertices contributes its
+        ⌈avg degree⌉ to every k < v, so the per-k maxima are the
+        reverse cumulative max of the per-state ceilings — no per-k
+        re-peeling.
+
+        Args:
+            max_k: Largest k to report (clamped to n)
+
+        Returns:
+            int64 array of length max_k+1 with entry k equal to αk(G)
+        """
+        n = self.n
+        max_k = min(max_k, n)
+        alpha_arr = np.zeros(max(max_k, 0) + 1, dtype=np.int64)
+        if n == 0 or max_k < 0:
+            return alpha_arr
+
+        _, _, edges_at_step = self._peel_full()
+        counts = (n - np.arange(n + 1)).astype(np.int64)
+        ceil_avg = np.zeros(n + 1, dtype=np.int64)
+        alive = counts > 0
+        ceil_avg[alive] = ((2 * edges_at_step[alive] + counts[alive] - 1)
+                           // counts[alive])
+        # prefix_max[i] = best ceiling among states with >= n-i vertices,
+        # so αk = prefix_max[n-k]
+        prefix_max = np.maximum.accumulate(ceil_avg)
+        alpha_arr[:] = prefix_max[n - np.arange(max_k + 1)]
+        return alpha_arr
+
     def compute_alpha_k_removal(self, k: int) -> Tuple[int, Optional[nx.Graph]]:
         """
         Compute αk(G) using the removal algorithm from the PDF
@@ -86,52 +288,37 @@ class LargeSetArboricity:
         n = self.n
         if k >= n:
             # If k >= n, return average degree of entire graph
-            if self.G.number_of_edges() == 0:
+            m = self.G.number_of_edges()
+            if m == 0:
                 return 0, None
-            avg_deg = 2 * self.G.number_of_edges() / n
-            return math.ceil(avg_deg), self.G.copy()
-        
-        if k <= 0:
-            return 0, None
+            return (2 * m + n - 1) // n, self.G.copy()
         
-        H = self.G.copy()
-        max_alpha = 0
+        if k < 0:
+            k = 0
+        if k in self._alpha_removal_cache:
+            return self._alpha_removal_cache[k]
+
+        # The removal order is k-independent: read the answer off the
+        # shared peel trace instead of re-peeling for this k. States
+        # 0..n-k cover the subgraphs with n down to k vertices.
+        removal_order, _, edges_at_step = self._peel_full()
+        edges = edges_at_step[:n - k + 1]
+        counts = (n - np.arange(n - k + 1)).astype(np.int64)
+        scores = np.where((edges > 0) & (counts > 0),
+                          (2 * edges + np.maximum(counts, 1) - 1)
+                          // np.maximum(counts, 1), 0)
+        # argmax takes the earliest maximizing state, matching the old
+        # strict-improvement update order
+        best_step = int(np.argmax(scores))
+        max_alpha = int(scores[best_step])
+
         best_subgraph = None
-        
-        # Remove n-k vertices (one at a time, minimum degree first)
-        num_removals = n - k
-        
-        for step in range(num_removals):
-            if H.number_of_nodes() == 0:
-                break
-            
-            # Compute average degree of current subgraph
-            if H.number_of_nodes() > k and H.number_of_edges() > 0:
-                avg_deg = 2 * H.number_of_edges() / H.number_of_nodes()
-                alpha_val = math.ceil(avg_deg)
-                if alpha_val > max_alpha:
-                    max_alpha = alpha_val
-                    best_subgraph = H.copy()
-            
-            # Find and remove minimum degree vertex
-            min_deg = float('inf')
-            min_vertex = None
-            for v in H.nodes():
-                deg = H.degree(v)
-                if deg < min_deg:
-                    min_deg = deg
-                    min_vertex = v
-            
-            H.remove_node(min_vertex)
-        
-        # Check final subgraph (k vertices remaining)
-        if H.number_of_nodes() > 0 and H.number_of_edges() > 0:
-            avg_deg = 2 * H.number_of_edges() / H.number_of_nodes()
-            alpha_val = math.ceil(avg_deg)
-            if alpha_val > max_alpha:
-                max_alpha = alpha_val
-                best_subgraph = H.copy()
-        
+        if max_alpha > 0:
+            # Vertices not yet removed at best_step form the witness;
+            # one subgraph copy at the end instead of one per improvement
+            best_subgraph = self.G.subgraph(removal_order[best_step:]).copy()
+
+        self._alpha_removal_cache[k] = (max_alpha, best_subgraph)
         return max_alpha, best_subgraph
     
     def compute_alpha_k_exact(self, k: int) -> Tuple[int, Optional[nx.Graph]]:
@@ -152,33 +339,113 @@ class LargeSetArboricity:
         if n > 15:
             print(f"Warning: Graph too large (n={n}) for exact αk computation")
             return None, None
-        
-        nodes = list(self.G.nodes())
+
+        if k in self._alpha_exact_cache:
+            return self._alpha_exact_cache[k]
+
+        # The per-subset edge/size tables are k-independent; only the
+        # scoring threshold changes with k, so fill them once and answer
+        # each k with a vectorized sweep
+        self._ensure_subset_tables()
+        edges = self._subset_edges
+        sizes = self._subset_sizes
+
         max_alpha = 0
+        best_mask = 0
+        valid = (sizes > k) & (edges > 0)
+        if valid.any():
+            scores = np.where(
+                valid, (2 * edges + sizes - 1) // np.maximum(sizes, 1), 0)
+            best_mask = int(np.argmax(scores))
+            max_alpha = int(scores[best_mask])
+
         best_subgraph = None
-        
-        # Check all subsets of size > k
-        for size in range(k + 1, n + 1):
-            for subset in combinations(nodes, size):
-                subgraph = self.G.subgraph(subset)
-                if subgraph.number_of_nodes() > 0 and subgraph.number_of_edges() > 0:
-                    avg_deg = 2 * subgraph.number_of_edges() / subgraph.number_of_nodes()
-                    alpha_val = math.ceil(avg_deg)
-                    if alpha_val > max_alpha:
-                        max_alpha = alpha_val
-                        best_subgraph = subgraph.copy()
-        
+        if best_mask:
+            best_nodes = [self.nodes[i] for i in range(n) if best_mask >> i & 1]
+            best_subgraph = self.G.subgraph(best_nodes).copy()
+
+        self._alpha_exact_cache[k] = (max_alpha, best_subgraph)
         return max_alpha, best_subgraph
+
+    def _ensure_subset_tables(self):
+        """
+        Fill per-subset |E(S)| and |S| tables for all 2^n subsets.
+
+        Gray-code order flips exactly one vertex between consecutive
+        subsets, so both quantities update with one masked popcount per
+        step instead of a full recount — O(1) amortized per subset.
+        """
+        if self._subset_edges is not None:
+            return
+
+        n = self.n
+        if self._adj_bits is None:
+            node_to_id = self.node_to_id
+            self._adj_bits = [
+                sum(1 << node_to_id[u] for u in self.G._adj[v])
+                for v in self.nodes
+            ]
+        adj = self._adj_bits
+
+        total = 1 << n
+        edges = np.zeros(total, dtype=np.int32)
+        sizes = np.zeros(total, dtype=np.int8)
+
+        g_prev = 0
+        e = 0
+        s = 0
+        for i in range(1, total):
+            g = i ^ (i >> 1)
+            bit = (g ^ g_prev).bit_length() - 1
+            if g >> bit & 1:
+                e += (adj[bit] & g_prev).bit_count()
+                s += 1
+            else:
+                e -= (adj[bit] & g).bit_count()
+                s -= 1
+            g_prev = g
+            edges[g] = e
+            sizes[g] = s
+
+        self._subset_edges = edges
+        self._subset_sizes = sizes
     
+    def _peel_both(self, k: int) -> Tuple[int, int]:
+        """
+        Compute dk(G) and αk(G) from ONE peel instead of two.
+
+        The removal order is shared: dk is the max degree over the first
+        n-k removals, αk the running max of ⌈avg degree⌉ over the same
+        peel states — both read off the _peel_full() record.
+
+        Returns:
+            (dk_value, alpha_k)
+        """
+        n = self.n
+        if n == 0:
+            return 0, 0
+
+        kk = min(max(k, 0), n)
+        _, degree_at_removal, edges_at_step = self._peel_full()
+        take = n - kk
+        dk_value = int(degree_at_removal[:take].max()) if take > 0 else 0
+
+        edges = edges_at_step[:take + 1]
+        counts = (n - np.arange(take + 1)).astype(np.int64)
+        ok = (edges > 0) & (counts > 0)
+        vals = (2 * edges + np.maximum(counts, 1) - 1) // np.maximum(counts, 1)
+        alpha_k = int(vals.max(initial=0, where=ok))
+
+        return dk_value, alpha_k
+
     def verify_approximation(self, k: int) -> dict:
         """
         Verify that dk(G) ≤ αk(G) ≤ 2·dk(G)
-        
+
         Returns:
             Dictionary with verification results
         """
-        dk_value, _ = self.modified_degeneracy_algorithm(k)
-        alpha_k, _ = self.compute_alpha_k_removal(k)
+        dk_value, alpha_k = self._peel_both(k)
         
         if alpha_k is None:
             return {
@@ -203,34 +470,165 @@ class LargeSetArboricity:
             'ratio': ratio
         }
     
-    def plot_alpha_k_vs_k(self, k_range: Optional[List[int]] = None, 
-                          save_path: Optional[str] = None):
+    def _peel_full(self):
+        """
+        Run the min-degree peel ONCE, recording per-step state.
+
+        The removal order is k-independent, so one peel is enough to
+        derive dk(G) and αk(G) for every k afterwards.
+
+        Returns:
+            (removal_order, degree_at_removal, edges_at_step) where
+            degree_at_removal[s] is the degree of the vertex removed at
+            step s and edges_at_step[s] is the edge count before step s.
+        """
+        if self._peel_cache is not None:
+            return self._peel_cache
+
+        cache_path = self._peel_disk_path()
+        if cache_path is not None and os.path.exists(cache_path):
+            try:
+                with np.load(cache_path) as data:
+                    order_ids = data['order_ids']
+                    degree_at_removal = data['degree_at_removal']
+                    edges_at_step = data['edges_at_step']
+            except (OSError, ValueError, KeyError):
+                # Corrupt or partial entry: fall through and rebuild it
+                pass
+            else:
+                removal_order = [self.nodes[v] for v in order_ids]
+                self._peel_cache = (removal_order, degree_at_removal,
+                                    edges_at_step)
+                return self._peel_cache
+
+        n = self.n
+        m = int(self._deg0.sum()) // 2
+        edges_at_step = np.zeros(n + 1, dtype=np.int64)
+        edges_at_step[0] = m
+
+        if NUMBA_AVAILABLE:
+            order_ids, degree_at_removal = _peel_min_degree(
+                self.indptr, self.indices, self._deg0)
+            # Each removal deletes exactly deg-at-removal edges
+            edges_at_step[1:] = m - np.cumsum(degree_at_removal,
+                                              dtype=np.int64)
+        else:
+            # Pure-Python fallback: min-heap with lazy deletion. Stale
+            # entries (pushed before a degree decrease) are skipped on
+            # pop by comparing against the current degree, giving
+            # O((n + m) log n) instead of an argmin scan per step.
+            indptr, indices = self.indptr, self.indices
+            deg = self._deg0.copy()
+            alive = np.ones(n, dtype=bool)
+
+            order_ids = np.zeros(n, dtype=np.int32)
+            degree_at_removal = np.zeros(n, dtype=np.int32)
+
+            heap = [(int(deg[v]), v) for v in range(n)]
+            heapq.heapify(heap)
+            for step in range(n):
+                while True:
+                    min_deg, v = heapq.heappop(heap)
+                    if alive[v] and min_deg == deg[v]:
+                        break
+
+                order_ids[step] = v
+                degree_at_removal[step] = min_deg
+                alive[v] = False
+                for u in indices[indptr[v]:indptr[v + 1]]:
+                    if alive[u]:
+                        deg[u] -= 1
+                        heapq.heappush(heap, (int(deg[u]), int(u)))
+
+                m -= min_deg
+                edges_at_step[step + 1] = m
+
+        if cache_path is not None:
+            np.savez(cache_path, order_ids=order_ids,
+                     degree_at_removal=degree_at_removal,
+                     edges_at_step=edges_at_step)
+
+        removal_order = [self.nodes[v] for v in order_ids]
+        self._peel_cache = (removal_order, degree_at_removal, edges_at_step)
+        return self._peel_cache
+
+    def _peel_disk_path(self) -> Optional[str]:
+        """
+        Locate this graph's peel trace in the on-disk cache.
+
+        Entries are keyed by a blake2b hash of the CSR arrays, so any
+        change to the adjacency gets a fresh entry. Stored arrays hold
+        vertex ids (positions in self.nodes), not labels, which keeps
+        the .npz purely numeric.
+
+        Returns:
+            Path of the .npz entry, or None when caching is disabled.
+        """
+        if self._peel_cache_dir is None:
+            return None
+        h = hashlib.blake2b(digest_size=16)
+        h.update(self.indptr.tobytes())
+        h.update(self.indices.tobytes())
+        os.makedirs(self._peel_cache_dir, exist_ok=True)
+        return os.path.join(self._peel_cache_dir,
+                            f'peel_{h.hexdigest()}.npz')
+
+    def plot_alpha_k_vs_k(self, k_range: Optional[List[int]] = None,
+                          save_path: Optional[str] = None,
+                          show: bool = False):
         """
         Plot αk(G) and dk(G) as functions of k
-        
+
         Args:
             k_range: List of k values to plot (default: 1 to n-1)
             save_path: Path to save the plot (optional)
+            show: Open an interactive window (default off so batch runs
+                over many datasets never block on a GUI event loop)
         """
+        # Deferred: matplotlib costs ~200ms at import and headless users
+        # of the algorithms never need it; force Agg when no display is
+        # available so savefig skips the GUI pipeline
+        import os
+        import matplotlib
+        if not os.environ.get('DISPLAY'):
+            matplotlib.use('Agg')
+        import matplotlib.pyplot as plt
+
         if k_range is None:
             k_range = list(range(1, self.n))
-        
-        alpha_values = []
-        dk_values = []
-        
+
+        n = self.n
         print(f"Computing αk and dk for k in {min(k_range)} to {max(k_range)}...")
-        for k in k_range:
-            alpha_k, _ = self.compute_alpha_k_removal(k)
-            dk, _ = self.modified_degeneracy_algorithm(k)
-            alpha_values.append(alpha_k)
-            dk_values.append(dk)
-            print(f"  k={k}: αk={alpha_k}, dk={dk}")
-        
+
+        # One peel; every dk(k)/αk(k) is a running max over its states
+        _, degree_at_removal, edges_at_step = self._peel_full()
+
+        # dk(k) = max degree among the first n-k removals (prefix max)
+        dk_prefix_max = np.maximum.accumulate(degree_at_removal)
+
+        # αk(k) = max ⌈avg degree⌉ over the first n-k peel states (prefix max)
+        vertices_at_step = (n - np.arange(n + 1)).astype(np.int64)
+        ceil_avg = np.zeros(n + 1, dtype=np.int64)
+        alive = vertices_at_step > 0
+        ceil_avg[alive] = ((2 * edges_at_step[alive] + vertices_at_step[alive]
+                            - 1) // vertices_at_step[alive])
+        alpha_prefix_max = np.maximum.accumulate(ceil_avg)
+
+        # Pure fancy indexing: every k is answered by one array lookup
+        k_arr = np.clip(np.asarray(k_range, dtype=np.int64), 0, n)
+        take = n - k_arr
+        dk_values = np.where(take > 0,
+                             dk_prefix_max[np.maximum(take, 1) - 1], 0)
+        alpha_values = alpha_prefix_max[take]
+        print(f"  αk in [{alpha_values.min()}, {alpha_values.max()}], "
+              f"dk in [{dk_values.min()}, {dk_values.max()}] "
+              f"over {len(k_arr)} k values")
+
         # Create plot
-        plt.figure(figsize=(10, 6))
+        fig = plt.figure(figsize=(10, 6))
         plt.plot(k_range, alpha_values, 'b-o', label='αk(G)', linewidth=2, markersize=6)
         plt.plot(k_range, dk_values, 'r--s', label='dk(G)', linewidth=2, markersize=6)
-        plt.plot(k_range, [2*d for d in dk_values], 'g:', label='2·dk(G)', linewidth=1.5)
+        plt.plot(k_range, 2 * dk_values, 'g:', label='2·dk(G)', linewidth=1.5)
         
         plt.xlabel('k (large set size)', fontsize=12)
         plt.ylabel('Value', fontsize=12)
@@ -252,8 +650,11 @@ class LargeSetArboricity:
         if save_path:
             plt.savefig(save_path, dpi=300, bbox_inches='tight')
             print(f"Plot saved to {save_path}")
-        
-        plt.show()
+
+        if show:
+            plt.show()
+        # Release the figure so repeated analyses don't accumulate
+        plt.close(fig)
 
 
 def create_test_graphs():
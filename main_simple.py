@@ -11,7 +11,7 @@ Example:
 
 import sys
 from snap_api import load_snap_graph
-from large_set_arboricity import LargeSetArboricity
+from large_set_arboricity_updated import LargeSetArboricity
 from plot_alpha_k import plot_alpha_k_vs_k
 
 
@@ -51,30 +51,36 @@ def main():
     print("-" * 60)
     
     max_k = min(n - 1, 10)  # Analyze k from 0 to 10
-    
-    for k in range(max_k + 1):
-        # Compute dk(G)
-        dk_G, _ = lsa.modified_degeneracy_algorithm(k)
-        
+
+    # One peel covers dk for every k at once
+    k_values = list(range(max_k + 1))
+    dk_values = lsa.modified_degeneracy_batch(max_k).tolist()
+    alpha_k_values = []
+
+    for k in k_values:
+        dk_G = dk_values[k]
+
         # Compute αk(G) if small enough
         if n <= 15:
             alpha_k, _ = lsa.compute_alpha_k_exact(k)
+            alpha_k_values.append(alpha_k)
             ratio = alpha_k / dk_G if dk_G > 0 else float('inf')
-            
+
             # Check bounds
             lower_ok = dk_G <= alpha_k
             upper_ok = alpha_k <= 2 * dk_G
             bounds_ok = '✓' if (lower_ok and upper_ok) else '✗'
-            
+
             print(f"{k:<5} {dk_G:<10} {alpha_k:<10} {ratio:<10.3f} {bounds_ok}")
         else:
             print(f"{k:<5} {dk_G:<10} {'N/A':<10} {'N/A':<10} {'N/A'}")
-    
+
     # Generate plot
     if n <= 15:
         print(f"\n3. Generating plot...")
-        plot_alpha_k_vs_k(G, graph_name, max_k=max_k, 
-                         save_path=f"{graph_name}_plot.png")
+        plot_alpha_k_vs_k(k_values, dk_values, alpha_k_values,
+                          graph_name=graph_name,
+                          save_path=f"{graph_name}_plot.png")
         print(f"   Saved to: {graph_name}_plot.png")
     else:
         print(f"\n3. Graph too large (n={n}) for exact computation and plotting.")
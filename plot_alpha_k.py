@@ -3,11 +3,24 @@
 Plotting utilities for large-set-arboricity analysis
 """
 
-import matplotlib.pyplot as plt
+import os
 import numpy as np
 from typing import List, Tuple
 
 
+def _import_pyplot():
+    """Import pyplot on demand, headless-safe.
+
+    Deferred so callers that only compute never pay the matplotlib
+    import; forced onto Agg when no display is available.
+    """
+    import matplotlib
+    if not os.environ.get('DISPLAY'):
+        matplotlib.use('Agg')
+    import matplotlib.pyplot as plt
+    return plt
+
+
 def compute_alpha_k_for_all_k(lsa, max_k=None):
     """
     Compute dk and αk for all k values from 1 to max_k
@@ -49,14 +62,15 @@ def plot_alpha_k_vs_k(k_values, dk_values, alpha_k_values, graph_name="Graph", s
         graph_name: Name for the plot title
         save_path: Optional path to save the plot
     """
+    plt = _import_pyplot()
     fig, ax = plt.subplots(figsize=(10, 6))
-    
+
     # Plot dk and αk
     ax.plot(k_values, dk_values, 'b-o', label='dk(G)', linewidth=2, markersize=6)
     ax.plot(k_values, alpha_k_values, 'r-s', label='αk(G)', linewidth=2, markersize=6)
     
     # Fill approximation bounds
-    ax.fill_between(k_values, dk_values, [2*d for d in dk_values], 
+    ax.fill_between(k_values, dk_values, 2 * np.asarray(dk_values),
                      alpha=0.2, color='green', label='2-approximation bounds')
     
     # Labels and title
@@ -70,9 +84,9 @@ def plot_alpha_k_vs_k(k_values, dk_values, alpha_k_values, graph_name="Graph", s
     plt.tight_layout()
     
     if save_path:
-        plt.savefig(save_path, dpi=300, bbox_inches='tight')
+        plt.savefig(save_path, dpi=150, bbox_inches='tight')
         print(f"Saved plot to: {save_path}")
-    
+
     return fig
 
 
@@ -88,7 +102,8 @@ def plot_approximation_quality(k_values, dk_values, alpha_k_values, graph_name="
         save_path: Optional path to save the plot
     """
     ratios = [a/d if d > 0 else 0 for a, d in zip(alpha_k_values, dk_values)]
-    
+
+    plt = _import_pyplot()
     fig, ax = plt.subplots(figsize=(10, 6))
     
     ax.plot(k_values, ratios, 'g-^', linewidth=2, markersize=6, label='αk(G)/dk(G)')
@@ -106,9 +121,9 @@ def plot_approximation_quality(k_values, dk_values, alpha_k_values, graph_name="
     plt.tight_layout()
     
     if save_path:
-        plt.savefig(save_path, dpi=300, bbox_inches='tight')
+        plt.savefig(save_path, dpi=150, bbox_inches='tight')
         print(f"Saved plot to: {save_path}")
-    
+
     return fig
 
 
@@ -120,4 +135,4 @@ if __name__ == '__main__':
     alpha_k_values = [2, 4, 5, 6, 7]
     
     plot_alpha_k_vs_k(k_values, dk_values, alpha_k_values, "Test Graph")
-    plt.show()
+    _import_pyplot().show()
@@ -9,7 +9,7 @@ import sys
 import matplotlib.pyplot as plt
 import networkx as nx
 from snap_api import load_snap_graph
-from large_set_arboricity import LargeSetArboricity
+from large_set_arboricity_updated import LargeSetArboricity
 
 
 # ============================================================================
@@ -74,22 +74,18 @@ def create_plot(G):
     
     print(f"\nComputing dk(G) for k=0 to {max_k}...")
     
-    dk_values = []
+    # All dk values come from one peel instead of re-running per k
+    dk_values = lsa.modified_degeneracy_batch(max_k).tolist()
+
     alpha_values = []
-    
-    for i, k in enumerate(k_values):
-        # Always compute dk
-        dk_G, _ = lsa.modified_degeneracy_algorithm(k)
-        dk_values.append(dk_G)
-        
-        # Compute exact αk if possible
-        if can_compute_alpha:
+    if can_compute_alpha:
+        for i, k in enumerate(k_values):
             alpha_k, _ = lsa.compute_alpha_k_exact(k)
             alpha_values.append(alpha_k)
-        
-        # Progress
-        if (i + 1) % 10 == 0 or i == len(k_values) - 1:
-            print(f"  Progress: {i+1}/{len(k_values)}")
+
+            # Progress
+            if (i + 1) % 10 == 0 or i == len(k_values) - 1:
+                print(f"  Progress: {i+1}/{len(k_values)}")
     
     print(f"✓ Computation complete")
     
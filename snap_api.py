@@ -5,11 +5,17 @@ Downloads real graphs from Stanford SNAP dataset
 Works on Windows/Fedora with caching support
 """
 
-import networkx as nx
+from __future__ import annotations
+
+import numpy as np
 import urllib.request
 import gzip
 import io
 import os
+import pickle
+import shutil
+import warnings
+from contextlib import contextmanager
 from typing import Optional, Dict
 
 
@@ -83,6 +89,13 @@ class SNAPLoader:
         'amazon0601': {'n': 403394, 'm': 3387388, 'desc': 'Amazon product network'},
     }
     
+    # Process-level cache of fully preprocessed graphs, keyed by
+    # dataset, cache dir and preprocessing flags. Repeated loads from
+    # sweeps, notebooks or tests skip download and parsing entirely.
+    # Callers treat loaded graphs as read-only, so hits return the
+    # same object rather than a copy.
+    _GRAPH_CACHE: Dict[tuple, nx.Graph] = {}
+
     def __init__(self, cache_dir: str = './snap_cache'):
         """
         Initialize SNAP loader.
@@ -93,26 +106,67 @@ class SNAPLoader:
         self.cache_dir = cache_dir
         os.makedirs(cache_dir, exist_ok=True)
     
-    def load(self, dataset_name: str, 
+    def load(self, dataset_name: str,
              use_cache: bool = True,
              largest_component: bool = True,
-             remove_self_loops: bool = True) -> nx.Graph:
+             remove_self_loops: bool = True,
+             use_binary_cache: bool = True) -> nx.Graph:
         """
         Load a SNAP graph by name.
-        
+
         Args:
             dataset_name: Name of dataset (e.g., 'ca-GrQc')
             use_cache: Use cached file if available
             largest_component: Extract largest connected component
             remove_self_loops: Remove self-loops from graph
-            
+            use_binary_cache: Keep a pickle of the fully preprocessed
+                graph next to the .gz, so later runs skip parsing and
+                preprocessing entirely
+
         Returns:
             NetworkX Graph
         """
+        # NetworkX is imported on first use so list_datasets/--help
+        # style invocations skip its ~0.5s import
+        import networkx as nx
+
         if dataset_name not in self.DATASETS:
             raise ValueError(f"Unknown dataset: {dataset_name}\n"
                            f"Available: {list(self.DATASETS.keys())}")
-        
+
+        cache_key = (dataset_name, os.path.abspath(self.cache_dir),
+                     largest_component, remove_self_loops)
+        if use_cache and cache_key in self._GRAPH_CACHE:
+            G = self._GRAPH_CACHE[cache_key]
+            print(f"Loading {dataset_name}... (in-memory cache)")
+            print(f"✓ Loaded: {G.number_of_nodes():,} nodes, "
+                  f"{G.number_of_edges():,} edges")
+            return G
+
+        # Binary cache of the preprocessed graph: one pickle.load
+        # replaces parse + self-loop removal + component extraction.
+        # The name encodes the preprocessing flags, and the entry is
+        # invalidated when the .gz it was built from is newer
+        pkl_file = os.path.join(
+            self.cache_dir,
+            f'{dataset_name}.lc{int(largest_component)}'
+            f'sl{int(remove_self_loops)}.graph.pkl')
+        gz_file = os.path.join(self.cache_dir, f'{dataset_name}.txt.gz')
+        if use_cache and use_binary_cache and os.path.exists(pkl_file):
+            if (not os.path.exists(gz_file)
+                    or os.path.getmtime(pkl_file) >= os.path.getmtime(gz_file)):
+                try:
+                    with open(pkl_file, 'rb') as f:
+                        G = pickle.load(f)
+                except (OSError, pickle.UnpicklingError, EOFError):
+                    pass  # corrupt entry: rebuild it below
+                else:
+                    print(f"Loading {dataset_name}... (binary cache)")
+                    print(f"✓ Loaded: {G.number_of_nodes():,} nodes, "
+                          f"{G.number_of_edges():,} edges")
+                    self._GRAPH_CACHE[cache_key] = G
+                    return G
+
         # Get metadata
         meta = self.METADATA.get(dataset_name, {})
         print(f"Loading {dataset_name}...")
@@ -131,19 +185,61 @@ class SNAPLoader:
                 G.remove_edges_from(nx.selfloop_edges(G))
                 print(f"  Removed {n_self_loops} self-loops")
         
-        if largest_component and not nx.is_connected(G):
-            components = list(nx.connected_components(G))
-            largest = max(components, key=len)
-            G = G.subgraph(largest).copy()
-            print(f"  Extracted largest component: {len(largest):,} nodes")
+        if largest_component and G.number_of_nodes() > 0:
+            # One C-level union-find pass over the sparse adjacency
+            # instead of Python BFS for is_connected + components
+            from scipy.sparse.csgraph import connected_components
+            nodes = list(G.nodes())
+            A = nx.to_scipy_sparse_array(G, nodelist=nodes, format='csr',
+                                         dtype=np.int8)
+            n_comp, labels = connected_components(A, directed=False)
+            if n_comp > 1:
+                keep = labels == np.bincount(labels).argmax()
+                largest = [nodes[i] for i in np.flatnonzero(keep)]
+                G = G.subgraph(largest).copy()
+                print(f"  Extracted largest component: {len(largest):,} nodes")
         
         n = G.number_of_nodes()
         m = G.number_of_edges()
         print(f"✓ Loaded: {n:,} nodes, {m:,} edges")
         print(f"  Average degree: {2*m/n:.2f}")
-        
+
+        if use_cache:
+            self._GRAPH_CACHE[cache_key] = G
+            if use_binary_cache:
+                try:
+                    tmp = pkl_file + '.tmp'
+                    with open(tmp, 'wb') as f:
+                        pickle.dump(G, f, protocol=pickle.HIGHEST_PROTOCOL)
+                    os.replace(tmp, pkl_file)
+                except OSError:
+                    pass  # unwritable cache dir: the .gz path still works
         return G
     
+    def load_csr(self, dataset_name: str, **kwargs):
+        """
+        Load a dataset directly as CSR adjacency arrays.
+
+        The peel kernels work on flat arrays; this hands them the CSR
+        form straight away (a contiguous int32 slice per vertex,
+        ~10x smaller than the dict-of-dicts graph) with nodes
+        relabelled to dense ids in the order load() reports them.
+
+        Args:
+            dataset_name: Name of dataset (e.g., 'ca-GrQc')
+            **kwargs: Forwarded to load()
+
+        Returns:
+            (indptr, indices): int32 CSR arrays of the undirected
+            adjacency
+        """
+        import networkx as nx
+
+        G = self.load(dataset_name, **kwargs)
+        A = nx.to_scipy_sparse_array(G, nodelist=list(G.nodes()),
+                                     format='csr', dtype=np.int8)
+        return A.indptr.astype(np.int32), A.indices.astype(np.int32)
+
     def _download_and_parse(self, dataset_name: str, use_cache: bool) -> nx.Graph:
         """Download and parse graph from SNAP."""
         url = self.DATASETS[dataset_name]
@@ -153,25 +249,35 @@ class SNAPLoader:
         if use_cache and os.path.exists(cache_file):
             print(f"  Using cached file: {cache_file}")
             with gzip.open(cache_file, 'rt') as f:
-                return self._parse_snap_edgelist(f.read())
-        
+                return self._parse_snap_edgelist(f)
+
         # Download
         print(f"  Downloading from SNAP...")
         try:
-            with urllib.request.urlopen(url) as response:
-                compressed_data = response.read()
-            
-            # Save to cache
-            with open(cache_file, 'wb') as f:
-                f.write(compressed_data)
-            print(f"  ✓ Downloaded and cached to {cache_file}")
-            
-            # Parse
-            with gzip.GzipFile(fileobj=io.BytesIO(compressed_data)) as f:
-                content = f.read().decode('utf-8')
-            
-            return self._parse_snap_edgelist(content)
-        
+            with self._download_lock(cache_file):
+                # Re-check under the lock: a parallel sweep may have
+                # finished this download while we waited
+                if not os.path.exists(cache_file):
+                    # Stream to a .part file in 1 MiB chunks and rename
+                    # into place only on success: the compressed payload
+                    # never sits fully in memory, and an interrupted
+                    # download can never leave a truncated .gz that
+                    # later runs would trust
+                    part_file = cache_file + '.part'
+                    try:
+                        with urllib.request.urlopen(url) as response, \
+                                open(part_file, 'wb') as f:
+                            shutil.copyfileobj(response, f, length=1 << 20)
+                        os.replace(part_file, cache_file)
+                    finally:
+                        if os.path.exists(part_file):
+                            os.remove(part_file)
+                    print(f"  ✓ Downloaded and cached to {cache_file}")
+
+            # Parse by decompressing on the fly from the cached gzip
+            with gzip.open(cache_file, 'rt') as f:
+                return self._parse_snap_edgelist(f)
+
         except Exception as e:
             print(f"✗ Error downloading: {e}")
             print("\nTroubleshooting:")
@@ -180,24 +286,60 @@ class SNAPLoader:
             print(f"3. Place file in: {self.cache_dir}/")
             raise
     
-    def _parse_snap_edgelist(self, text_content: str) -> nx.Graph:
-        """Parse SNAP edge list format (lines with comments starting with #)."""
+    @staticmethod
+    @contextmanager
+    def _download_lock(cache_file: str):
+        """
+        Serialize concurrent downloads of the same dataset.
+
+        An exclusive flock on a sidecar .lock file keeps parallel
+        sweeps from racing on one .gz; on platforms without fcntl
+        (Windows) this degrades to a no-op, matching the previous
+        behavior there.
+        """
+        try:
+            import fcntl
+        except ImportError:
+            yield
+            return
+        with open(cache_file + '.lock', 'w') as lock_fh:
+            fcntl.flock(lock_fh, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_fh, fcntl.LOCK_UN)
+
+    def _parse_snap_edgelist(self, source) -> nx.Graph:
+        """
+        Parse SNAP edge list format (lines with comments starting
+        with #) from a text stream or string.
+        """
+        import networkx as nx
+
+        fh = io.StringIO(source) if isinstance(source, str) else source
         G = nx.Graph()
-        
-        for line in text_content.split('\n'):
-            line = line.strip()
-            # Skip comments and empty lines
-            if not line or line.startswith('#'):
-                continue
-            
-            parts = line.split()
-            if len(parts) >= 2:
-                try:
-                    u, v = int(parts[0]), int(parts[1])
-                    G.add_edge(u, v)
-                except ValueError:
-                    continue  # Skip malformed lines
-        
+
+        try:
+            # Bulk-parse the whole stream in C instead of tokenizing
+            # each line in Python; columns beyond (u, v) are ignored
+            with warnings.catch_warnings():
+                warnings.simplefilter('ignore')  # empty files are fine
+                arr = np.loadtxt(fh, dtype=np.int64,
+                                 comments='#', usecols=(0, 1), ndmin=2)
+        except ValueError:
+            # Malformed lines: fall back to the tolerant per-line parser
+            fh.seek(0)
+            for line in fh:
+                parts = line.split()
+                if len(parts) >= 2 and not line.lstrip().startswith('#'):
+                    try:
+                        G.add_edge(int(parts[0]), int(parts[1]))
+                    except ValueError:
+                        continue
+            return G
+
+        if arr.size:
+            G.add_edges_from(arr.tolist())
         return G
     
     @classmethod
@@ -279,15 +421,18 @@ if __name__ == '__main__':
     print()
     
     try:
+        import networkx as nx
+
         G = load_snap_graph(dataset_name)
-        
+
         print("\n" + "="*80)
         print("GRAPH STATISTICS")
         print("="*80)
-        print(f"Nodes: {G.number_of_nodes():,}")
-        print(f"Edges: {G.number_of_edges():,}")
-        print(f"Average degree: {2*G.number_of_edges()/G.number_of_nodes():.2f}")
-        print(f"Density: {nx.density(G):.6f}")
+        n, m = G.number_of_nodes(), G.number_of_edges()
+        print(f"Nodes: {n:,}")
+        print(f"Edges: {m:,}")
+        print(f"Average degree: {2*m/n:.2f}")
+        print(f"Density: {2*m/(n*(n-1)) if n > 1 else 0.0:.6f}")
         print(f"Connected: {nx.is_connected(G)}")
         
         if G.number_of_nodes() <= 10000: